@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-14 18:33
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_post_image'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='post',
+            options={'ordering': ['-pub_date', '-id'], 'verbose_name': 'публикация', 'verbose_name_plural': 'Публикации'},
+        ),
+    ]
@@ -60,7 +60,18 @@ class Post(BaseModel):
                               blank=True)
 
     class Meta:
-        ordering = ['-pub_date']
+        ordering = ['-pub_date', '-id']
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                name='post_pubdate_desc_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='post_author_pubdate_idx',
+            ),
+        ]
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
 
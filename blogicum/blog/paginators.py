@@ -0,0 +1,103 @@
+from django.core.paginator import Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+# SQLite не сообщает границ целых столбцов, но хранит INTEGER в 64 битах
+# со знаком; выход за них роняет запрос.
+INTEGER_RANGE_FALLBACK = (-2 ** 63, 2 ** 63 - 1)
+
+
+class KeysetPage(Page):
+    """Страница, выбранная по курсору, а не по номеру."""
+
+    def __init__(self, object_list, paginator, previous_cursor, next_cursor):
+        super().__init__(object_list, None, paginator)
+        self.previous_cursor = previous_cursor
+        self.next_cursor = next_cursor
+
+    def __repr__(self):
+        return f'<Page before {self.next_cursor or "end"}>'
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator(Paginator):
+    """Пагинатор по курсору (pub_date, id) без OFFSET и COUNT(*).
+
+    Ожидает queryset, отсортированный по ('-pub_date', '-id'), как задано
+    в Post.Meta.ordering.
+    """
+
+    @property
+    def count(self):
+        return None
+
+    @staticmethod
+    def make_cursor(obj):
+        return f'{obj.pub_date.isoformat()},{obj.id}'
+
+    def get_id_range(self):
+        connection = connections[self.object_list.db]
+        min_id, max_id = connection.ops.integer_field_range(
+            self.object_list.model._meta.pk.get_internal_type()
+        )
+        if min_id is None:
+            min_id = INTEGER_RANGE_FALLBACK[0]
+        if max_id is None:
+            max_id = INTEGER_RANGE_FALLBACK[1]
+        return min_id, max_id
+
+    def parse_cursor(self, cursor):
+        pub_date, _, obj_id = cursor.rpartition(',')
+        min_id, max_id = self.get_id_range()
+        try:
+            pub_date = parse_datetime(pub_date)
+            obj_id = int(obj_id)
+            if pub_date is not None:
+                if timezone.is_naive(pub_date):
+                    raise ValueError
+                pub_date = pub_date.astimezone(timezone.utc)
+        except (ValueError, OverflowError):
+            pub_date = None
+        if pub_date is None or not min_id <= obj_id <= max_id:
+            raise Http404('Некорректный курсор страницы.')
+        return pub_date, obj_id
+
+    def get_cursor_page(self, before=None, after=None):
+        """Страница постов старше курсора before или новее курсора after."""
+        object_list = self.object_list
+        if after:
+            pub_date, obj_id = self.parse_cursor(after)
+            # Идём назад: берём ближайшие более новые посты и
+            # разворачиваем их в порядок «от новых к старым».
+            object_list = object_list.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=obj_id)
+            ).reverse()
+        elif before:
+            pub_date, obj_id = self.parse_cursor(before)
+            object_list = object_list.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=obj_id)
+            )
+        # Лишняя запись показывает, есть ли ещё страница в ту же сторону.
+        objects = list(object_list[:self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if after:
+            objects.reverse()
+        if not objects:
+            return KeysetPage(objects, self, None, None)
+        has_previous = has_more if after else bool(before)
+        has_next = True if after else has_more
+        return KeysetPage(
+            objects,
+            self,
+            self.make_cursor(objects[0]) if has_previous else None,
+            self.make_cursor(objects[-1]) if has_next else None,
+        )
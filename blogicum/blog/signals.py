@@ -0,0 +1,20 @@
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Category, Comment, Location, Post
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Location)
+def clear_post_list_cache(**kwargs):
+    """Сбрасывает закэшированные страницы ленты и категорий.
+
+    Сигналы не срабатывают для QuerySet.update() и bulk_create(), а
+    LocMemCache живёт в памяти одного процесса: при нескольких воркерах
+    сбрасывается кэш только того, что обработал изменение. В этих случаях
+    страницы обновятся по истечении POST_LIST_CACHE_TIMEOUT.
+    """
+    caches['pages'].clear()
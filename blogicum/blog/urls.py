@@ -1,17 +1,40 @@
+from functools import wraps
+
+from django.conf import settings
 from django.urls import path
+from django.views.decorators.cache import cache_page
 from . import views
 
 
+def cached_post_list(view):
+    """Кэширует страницу ленты только для анонимных посетителей.
+
+    У анонимов страница одна и та же независимо от cookies, поэтому в кэше
+    для каждого адреса хранится одна копия. Вошедшие пользователи всегда
+    получают страницу из представления без кэша.
+    """
+    cached_view = cache_page(settings.POST_LIST_CACHE_TIMEOUT,
+                             cache='pages')(view)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        return cached_view(request, *args, **kwargs)
+
+    return wrapper
+
+
 app_name = 'blog'
 
 urlpatterns = [
-    path('', views.PostListView.as_view(), name='index'),
+    path('', cached_post_list(views.PostListView.as_view()), name='index'),
     path('category/<slug:category>/',
-         views.CategoryPostsListView.as_view(),
+         cached_post_list(views.CategoryPostsListView.as_view()),
          name='category_posts'),
 
     path('posts/<int:post_id>/',
-         views.PostView.as_view(),
+         views.PostDetailView.as_view(),
          name='post_detail'),
 
     path('posts/create/',
@@ -27,7 +50,7 @@ urlpatterns = [
          name='delete_post'),
 
     path('posts/<int:post_id>/comment/',
-         views.PostView.as_view(),
+         views.CommentCreateView.as_view(),
          name='add_comment'),
     path('posts/<int:post_id>/edit_comment/<int:comment_id>/',
          views.CommentUpdateView.as_view(),
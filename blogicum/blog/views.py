@@ -2,77 +2,168 @@ from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy, reverse
 from django.views import generic
-from django.core.paginator import Paginator
 from .models import Post, Category, Comment
-from django.db.models import Count, Manager, QuerySet
+from django.db.models import (Case, Count, F, Manager, Prefetch, Q, QuerySet,
+                              TextField, Value, When)
+from django.db.models.functions import Concat, Length, Substr
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
 from django.http import HttpResponseRedirect, Http404
 from .forms import UserEditForm, CommentForm, PostForm
+from .paginators import KeysetPaginator
+
+
+User = get_user_model()
+
+# Поля, которые выводятся в карточке поста в списках; вместо полного
+# текста карточка получает аннотацию text_preview.
+POST_CARD_FIELDS = (
+    'id', 'title', 'pub_date', 'image', 'is_published',
+    'author__username',
+    'category__slug', 'category__title', 'category__is_published',
+    'location__name', 'location__is_published',
+)
+TEXT_PREVIEW_LENGTH = 200
+
+
+def get_visibility_conditions(only_published: bool = True,
+                              ban_delayed: bool = True,
+                              prefix: str = '') -> dict:
+    conditions = {}
+    if ban_delayed:
+        conditions[f'{prefix}pub_date__lt'] = timezone.now()
+    if only_published:
+        conditions[f'{prefix}is_published'] = True
+    return conditions
 
 
 def get_filtered_posts(manager: Manager,
                        only_published: bool = True,
                        ban_delayed: bool = True,
                        **conditions) -> QuerySet:
-    if ban_delayed:
-        conditions['pub_date__date__lt'] = timezone.now()
-    if only_published:
-        conditions['is_published'] = True
+    conditions.update(
+        get_visibility_conditions(only_published, ban_delayed)
+    )
 
     return manager.filter(
         **conditions,
     ).select_related(
         'author', 'location', 'category'
+    ).only(
+        *POST_CARD_FIELDS
+    ).annotate(
+        comment_count=Count('comments', distinct=True),
+        text_length=Length('text'),
     ).annotate(
-        comment_count=Count('comments')
+        # Обрезанный текст помечается многоточием, как это делает
+        # truncatewords, даже если в превью поместилось меньше 10 слов.
+        text_preview=Case(
+            When(
+                text_length__gt=TEXT_PREVIEW_LENGTH,
+                then=Concat(
+                    Substr('text', 1, TEXT_PREVIEW_LENGTH), Value('…')
+                ),
+            ),
+            default=F('text'),
+            output_field=TextField(),
+        ),
     ).order_by(*Post._meta.ordering)
 
 
+class CachedObjectMixin:
+    """Запоминает объект, чтобы не читать его из базы дважды за запрос."""
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+
+class PostDetailUrlMixin:
+    """Адрес страницы поста из URL, вычисляемый один раз за запрос."""
+
+    @cached_property
+    def post_detail_url(self):
+        return reverse('blog:post_detail',
+                       kwargs={'post_id': self.kwargs['post_id']})
+
+
+class PostMixin:
+    model = Post
+    pk_url_kwarg = 'post_id'
+
+
 class PostListView(generic.ListView):
     model = Post
     template_name = 'blog/index.html'
     context_object_name = 'object_list'
     paginate_by = 10
+    paginator_class = KeysetPaginator
 
     def get_queryset(self):
         return get_filtered_posts(Post.objects, category__is_published=True)
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        paginator = Paginator(self.get_queryset(), self.paginate_by)
-        page_number = self.request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
-        context['page_obj'] = page_obj
-        return context
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(queryset, page_size)
+        page = paginator.get_cursor_page(
+            before=self.request.GET.get('before'),
+            after=self.request.GET.get('after'),
+        )
+        return paginator, page, page.object_list, page.has_other_pages()
 
 
 class CategoryPostsListView(PostListView):
     template_name = 'blog/category.html'
 
     def get_queryset(self):
-        category_slug = self.kwargs.get('category')
-        self.category = get_object_or_404(
-            Category, slug=category_slug, is_published=True
+        # Категория проверяется в том же запросе, что и выборка постов.
+        return get_filtered_posts(
+            Post.objects,
+            category__slug=self.kwargs['category'],
+            category__is_published=True,
+        ).only(*POST_CARD_FIELDS, 'category__description')
+
+    def get_category(self, posts):
+        if posts:
+            return posts[0].category
+        # Постов на странице нет: отдельно убеждаемся, что категория есть.
+        return get_object_or_404(
+            Category.objects.only('slug', 'title', 'description'),
+            slug=self.kwargs['category'],
+            is_published=True
         )
-        return get_filtered_posts(self.category.posts)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['category'] = self.category
+        context['category'] = self.get_category(context['object_list'])
         return context
 
 
-class PostDetailView(generic.DetailView):
-    model = Post
+class PostDetailView(PostMixin, CachedObjectMixin, generic.DetailView):
     template_name = 'blog/detail.html'
     context_object_name = 'post'
-    pk_url_kwarg = 'post_id'
+
+    def get_queryset(self):
+        return Post.objects.select_related(
+            'author', 'location', 'category'
+        ).only(
+            *POST_CARD_FIELDS, 'text'
+        ).prefetch_related(
+            Prefetch(
+                'comments',
+                queryset=Comment.objects.select_related(
+                    'author'
+                ).order_by('created_at')
+            )
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['comments'] = self.object.comments.order_by('created_at')
+        context['comments'] = self.object.comments.all()
         context['form'] = CommentForm()
         return context
 
@@ -84,11 +175,9 @@ class PostDetailView(generic.DetailView):
         return super().dispatch(request, *args, **kwargs)
 
 
-class PostCreateView(generic.CreateView):
-    model = Post
+class PostCreateView(PostMixin, generic.CreateView):
     form_class = PostForm
     template_name = 'blog/create.html'
-    pk_url_kwarg = 'post_id'
 
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
@@ -103,11 +192,10 @@ class PostCreateView(generic.CreateView):
                             kwargs={'username': self.request.user.username})
 
 
-class PostUpdateView(generic.UpdateView):
-    model = Post
+class PostUpdateView(PostMixin, PostDetailUrlMixin, CachedObjectMixin,
+                     generic.UpdateView):
     form_class = PostForm
     template_name = 'blog/create.html'
-    pk_url_kwarg = 'post_id'
 
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
@@ -118,30 +206,22 @@ class PostUpdateView(generic.UpdateView):
             )
         post = self.get_object()
         if post.author != request.user:
-            return HttpResponseRedirect(
-                reverse('blog:post_detail',
-                        kwargs={'post_id': self.kwargs['post_id']})
-            )
+            return HttpResponseRedirect(self.post_detail_url)
         return super().dispatch(request, *args, **kwargs)
 
     def get_success_url(self):
-        return reverse('blog:post_detail',
-                       kwargs={'post_id': self.kwargs['post_id']})
+        return self.post_detail_url
 
 
-class PostDeleteView(generic.DeleteView):
-    model = Post
+class PostDeleteView(PostMixin, PostDetailUrlMixin, CachedObjectMixin,
+                     generic.DeleteView):
     template_name = 'blog/create.html'
-    pk_url_kwarg = 'post_id'
 
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
         post = self.get_object()
         if post.author != request.user:
-            return HttpResponseRedirect(
-                reverse('blog:post_detail',
-                        kwargs={'post_id': self.kwargs['post_id']})
-            )
+            return HttpResponseRedirect(self.post_detail_url)
         return super().dispatch(request, *args, **kwargs)
 
     def get_success_url(self):
@@ -149,7 +229,7 @@ class PostDeleteView(generic.DeleteView):
                             kwargs={'username': self.request.user.username})
 
 
-class CommentCreateView(generic.CreateView):
+class CommentCreateView(PostDetailUrlMixin, generic.CreateView):
     model = Comment
     form_class = CommentForm
     pk_url_kwarg = 'comment_id'
@@ -157,23 +237,25 @@ class CommentCreateView(generic.CreateView):
 
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
+        if not Post.objects.filter(pk=self.kwargs['post_id']).exists():
+            raise Http404("Пост не найден.")
         return super().dispatch(request, *args, **kwargs)
 
-    def get_post(self):
-        return get_object_or_404(Post, pk=self.kwargs['post_id'])
+    def get(self, request, *args, **kwargs):
+        # Форма комментария выводится на странице поста.
+        return HttpResponseRedirect(self.post_detail_url)
 
     def form_valid(self, form):
-        form.instance.post = self.get_post()
+        form.instance.post_id = self.kwargs['post_id']
         form.instance.author = self.request.user
         return super().form_valid(form)
 
     def get_success_url(self):
-        return reverse('blog:post_detail',
-                       kwargs={'post_id': self.kwargs['post_id']}
-                       ) + '#comments'
+        return self.post_detail_url + '#comments'
 
 
-class CommentUpdateView(generic.UpdateView):
+class CommentUpdateView(PostDetailUrlMixin, CachedObjectMixin,
+                        generic.UpdateView):
     model = Comment
     form_class = CommentForm
     pk_url_kwarg = 'comment_id'
@@ -183,27 +265,19 @@ class CommentUpdateView(generic.UpdateView):
     def dispatch(self, request, *args, **kwargs):
         comment = self.get_object()
         if comment.author != request.user:
-            return HttpResponseRedirect(
-                reverse('blog:post_detail',
-                        kwargs={'post_id': self.kwargs['post_id']})
-            )
+            return HttpResponseRedirect(self.post_detail_url)
         return super().dispatch(request, *args, **kwargs)
 
-    def get_post(self):
-        return get_object_or_404(Post, pk=self.kwargs['post_id'])
-
     def form_valid(self, form):
-        form.instance.post = self.get_post()
         form.instance.author = self.request.user
         return super().form_valid(form)
 
     def get_success_url(self):
-        return reverse('blog:post_detail',
-                       kwargs={'post_id': self.kwargs['post_id']}
-                       ) + '#comments'
+        return self.post_detail_url + '#comments'
 
 
-class CommentDeleteView(generic.DeleteView):
+class CommentDeleteView(PostDetailUrlMixin, CachedObjectMixin,
+                        generic.DeleteView):
     model = Comment
     pk_url_kwarg = 'comment_id'
     template_name = 'blog/comment.html'
@@ -212,10 +286,7 @@ class CommentDeleteView(generic.DeleteView):
     def dispatch(self, request, *args, **kwargs):
         comment = self.get_object()
         if comment.author != request.user:
-            return HttpResponseRedirect(
-                reverse('blog:post_detail',
-                        kwargs={'post_id': self.kwargs['post_id']})
-            )
+            return HttpResponseRedirect(self.post_detail_url)
         return super().dispatch(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs):
@@ -224,31 +295,29 @@ class CommentDeleteView(generic.DeleteView):
         return context
 
     def get_success_url(self):
-        return reverse('blog:post_detail',
-                       kwargs={'post_id': self.kwargs['post_id']}
-                       ) + '#comments'
-
-
-class PostView(generic.View):
-    def get(self, request, *args, **kwargs):
-        view = PostDetailView.as_view()
-        return view(request, *args, **kwargs)
-
-    def post(self, request, *args, **kwargs):
-        view = CommentCreateView.as_view()
-        return view(request, *args, **kwargs)
+        return self.post_detail_url + '#comments'
 
 
 class UserProfileView(PostListView):
     template_name = 'blog/profile.html'
 
     def dispatch(self, request, *args, **kwargs):
+        self.is_owner = request.user.is_authenticated \
+            and request.user.username == self.kwargs['username']
+        # Владелец видит все свои посты, остальные — только доступные всем;
+        # счётчик считается по тем же условиям, что и лента профиля.
+        self.only_visible = not self.is_owner
+        visible = get_visibility_conditions(
+            self.only_visible, self.only_visible, prefix='posts__'
+        )
         self.profile_user = get_object_or_404(
-            get_user_model(),
+            User.objects.annotate(
+                post_count=Count(
+                    'posts', filter=Q(**visible) if visible else None
+                )
+            ),
             username=self.kwargs['username']
         )
-        self.is_owner = request.user.is_authenticated \
-            and (request.user == self.profile_user)
         return super().dispatch(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs):
@@ -257,22 +326,16 @@ class UserProfileView(PostListView):
         return context_data
 
     def get_queryset(self):
-        if self.is_owner:
-            return get_filtered_posts(
-                Post.objects,
-                author__username=self.kwargs['username'],
-                only_published=False,
-                ban_delayed=False
-            )
-        else:
-            return get_filtered_posts(
-                Post.objects,
-                author__username=self.kwargs['username']
-            )
+        return get_filtered_posts(
+            Post.objects,
+            author=self.profile_user,
+            only_published=self.only_visible,
+            ban_delayed=self.only_visible
+        )
 
 
 class UserUpdateView(generic.UpdateView):
-    model = get_user_model()
+    model = User
     form_class = UserEditForm
     template_name = 'blog/user.html'
 
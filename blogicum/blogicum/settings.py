@@ -97,6 +97,21 @@ DATABASES = {
 }
 
 
+# Кэш: отдельное хранилище для закэшированных страниц ленты,
+# которое сбрасывается сигналами при изменении постов и комментариев.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pages',
+    },
+}
+
+POST_LIST_CACHE_TIMEOUT = 30
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -19,6 +19,7 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +42,12 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_pages_cache():
+    caches['pages'].clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
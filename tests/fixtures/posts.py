@@ -141,3 +141,30 @@ def create_post_context_form_item(
         ),
     )
     return result
+
+
+@pytest.fixture
+def make_post(mixer: Mixer, user, published_category):
+    def make(**fields):
+        fields = {
+            "author": user,
+            "category": published_category,
+            "location": None,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(minutes=1),
+            **fields,
+        }
+        return mixer.blend("blog.Post", **fields)
+
+    return make
+
+
+@pytest.fixture
+def posts_sharing_pub_dates(make_post):
+    # Больше двух страниц; посты идут группами по четыре с одинаковой
+    # pub_date, так что границы страниц попадают внутрь групп.
+    pub_date = timezone.now() - timedelta(days=1)
+    return [
+        make_post(pub_date=pub_date - timedelta(hours=i // 4))
+        for i in range(N_PER_PAGE * 2 + 5)
+    ]
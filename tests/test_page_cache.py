@@ -0,0 +1,82 @@
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+@pytest.fixture
+def cached_urls(published_category):
+    return [
+        reverse("blog:index"),
+        reverse("blog:category_posts", args=[published_category.slug]),
+    ]
+
+
+def get_without_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert not queries.captured_queries, (
+        f"Убедитесь, что повторный запрос `{url}` отдаётся из кэша."
+    )
+    return response
+
+
+@pytest.mark.django_db
+def test_saving_post_refreshes_cached_pages(client, cached_urls, make_post):
+    for url in cached_urls:
+        client.get(url)
+        get_without_queries(client, url)
+        post = make_post(title=f"Новый пост для {url}")
+        assert post.title in client.get(url).content.decode("utf-8"), (
+            "Убедитесь, что после сохранения поста кэш страниц сбрасывается."
+        )
+
+
+@pytest.mark.django_db
+def test_deleting_post_refreshes_cached_pages(client, make_post):
+    post = make_post(title="Удаляемый пост")
+    url = reverse("blog:index")
+    assert post.title in client.get(url).content.decode("utf-8")
+    post.delete()
+    assert post.title not in client.get(url).content.decode("utf-8"), (
+        "Убедитесь, что после удаления поста кэш страниц сбрасывается."
+    )
+
+
+@pytest.mark.django_db
+def test_model_changes_clear_cache(mixer, user, make_post):
+    location = mixer.blend("blog.Location")
+    post = make_post()
+    comment = mixer.blend("blog.Comment", author=user, post=post)
+    for action in ("save", "delete"):
+        for instance in (comment, post, post.category, location):
+            caches["pages"].set("page", "cached")
+            getattr(instance, action)()
+            assert caches["pages"].get("page") is None, (
+                f"Убедитесь, что {action}() для"
+                f" {type(instance).__name__} сбрасывает кэш страниц."
+            )
+
+
+@pytest.mark.django_db
+def test_anonymous_visitors_with_cookies_share_the_cache(client):
+    url = reverse("blog:index")
+    client.get(url)
+    client.cookies["csrftoken"] = "token"
+    get_without_queries(client, url)
+
+
+@pytest.mark.django_db
+def test_logged_in_users_bypass_the_cache(
+        client, another_user_client, make_post
+):
+    post = make_post(title="Старый заголовок")
+    url = reverse("blog:index")
+    client.get(url)
+    # update() не шлёт сигналов, поэтому кэш остаётся прежним.
+    type(post).objects.filter(pk=post.pk).update(title="Новый заголовок")
+    assert "Старый заголовок" in client.get(url).content.decode("utf-8")
+    assert "Новый заголовок" in (
+        another_user_client.get(url).content.decode("utf-8")
+    ), "Убедитесь, что вошедшие пользователи не получают страницу из кэша."
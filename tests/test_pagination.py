@@ -0,0 +1,86 @@
+from urllib.parse import urlencode
+
+import pytest
+from django.urls import reverse
+
+
+def get_page(client, **params):
+    url = reverse("blog:index")
+    if params:
+        url += "?" + urlencode(params)
+    response = client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return response.context["page_obj"]
+
+
+def listing_order(posts):
+    return [
+        post.id for post in sorted(
+            posts, key=lambda post: (post.pub_date, post.id), reverse=True
+        )
+    ]
+
+
+@pytest.mark.django_db
+def test_forward_walk_visits_every_post_once(client, posts_sharing_pub_dates):
+    page = get_page(client)
+    assert not page.has_previous()
+    seen = [post.id for post in page]
+    while page.has_next():
+        page = get_page(client, before=page.next_cursor)
+        assert page.has_previous()
+        seen.extend(post.id for post in page)
+    assert seen == listing_order(posts_sharing_pub_dates), (
+        "Убедитесь, что при переходе по курсору каждый пост выводится ровно"
+        " один раз и в порядке «от новых к старым»."
+    )
+
+
+@pytest.mark.django_db
+def test_backward_walk_returns_the_same_pages(
+        client, posts_sharing_pub_dates
+):
+    pages = [get_page(client)]
+    while pages[-1].has_next():
+        pages.append(get_page(client, before=pages[-1].next_cursor))
+    page = pages[-1]
+    for expected in reversed(pages[:-1]):
+        page = get_page(client, after=page.previous_cursor)
+        assert list(page) == list(expected), (
+            "Убедитесь, что переход назад по курсору `after` возвращает"
+            " ту же страницу, что и при движении вперёд."
+        )
+    assert not page.has_previous()
+    assert page.has_next()
+
+
+@pytest.mark.django_db
+def test_empty_first_page(client):
+    page = get_page(client)
+    assert list(page) == []
+    assert not page.has_other_pages()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("param", ["before", "after"])
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "junk",
+        "2020-01-01T00:00:00+00:00",
+        ",1",
+        "2020-01-01T00:00:00+00:00,x",
+        "2020-13-01T00:00:00+00:00,1",
+        "2020-01-01T00:00:00,1",
+        "0001-01-01T00:00:00+05:00,1",
+        "2020-01-01T00:00:00+00:00,99999999999999999999999",
+        "2020-01-01T00:00:00+00:00,-99999999999999999999999",
+    ],
+)
+def test_malformed_cursor_returns_404(client, param, cursor):
+    url = reverse("blog:index") + "?" + urlencode({param: cursor})
+    assert client.get(url).status_code == 404, (
+        "Убедитесь, что некорректный курсор страницы приводит к ошибке 404."
+    )
@@ -0,0 +1,44 @@
+import pytest
+from bs4 import BeautifulSoup
+from django.template import Context, Template
+from django.urls import reverse
+
+from blog.views import TEXT_PREVIEW_LENGTH
+
+
+def get_card(client, make_post, text):
+    make_post(text=text)
+    response = client.get(reverse("blog:index"))
+    card_text = BeautifulSoup(
+        response.content.decode("utf-8"), features="html.parser"
+    ).find("p", class_="card-text").text
+    return response.context["page_obj"][0], card_text
+
+
+@pytest.mark.django_db
+def test_short_text_is_not_marked(client, make_post):
+    post, _ = get_card(client, make_post, "Короткий текст")
+    assert post.text_preview == "Короткий текст"
+
+
+@pytest.mark.django_db
+def test_cut_text_ends_with_ellipsis(client, make_post):
+    post, _ = get_card(client, make_post, " ".join(["слово" * 10] * 5))
+    assert len(post.text_preview) == TEXT_PREVIEW_LENGTH + 1
+    assert post.text_preview.endswith("…"), (
+        "Убедитесь, что обрезанное превью текста заканчивается многоточием."
+    )
+
+
+@pytest.mark.django_db
+def test_card_matches_truncated_full_text(client, make_post):
+    text = " ".join(f"слово{i}" for i in range(200))
+    assert len(text) > TEXT_PREVIEW_LENGTH
+    _, card_text = get_card(client, make_post, text)
+    expected = Template("{{ text|truncatewords:10 }}").render(
+        Context({"text": text})
+    )
+    assert card_text == expected, (
+        "Убедитесь, что карточка поста выводит те же первые 10 слов текста,"
+        " что и `post.text|truncatewords:10`."
+    )
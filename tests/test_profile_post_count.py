@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+
+@pytest.fixture
+def profile_posts(make_post):
+    now = timezone.now()
+    return [
+        make_post(pub_date=now - timedelta(days=1)),
+        make_post(pub_date=now - timedelta(days=2)),
+        make_post(pub_date=now + timedelta(days=1)),
+        make_post(pub_date=now - timedelta(days=1), is_published=False),
+    ]
+
+
+def assert_count_matches_listing(client, user, expected):
+    response = client.get(reverse("blog:profile", args=[user.username]))
+    assert response.context["profile"].post_count == expected, (
+        "Убедитесь, что счётчик публикаций на странице пользователя"
+        " совпадает с лентой, которую видит посетитель."
+    )
+    assert len(response.context["page_obj"]) == expected
+
+
+@pytest.mark.django_db
+def test_owner_counts_all_own_posts(user_client, user, profile_posts):
+    assert_count_matches_listing(user_client, user, 4)
+
+
+@pytest.mark.django_db
+def test_visitor_counts_only_visible_posts(
+        another_user_client, user, profile_posts
+):
+    assert_count_matches_listing(another_user_client, user, 2)
+
+
+@pytest.mark.django_db
+def test_anonymous_counts_only_visible_posts(client, user, profile_posts):
+    assert_count_matches_listing(client, user, 2)